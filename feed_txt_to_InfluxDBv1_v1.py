@@ -5,7 +5,10 @@ Description:
   This script parses "*.txt log files" for the {MEASUREMENT},
   line by line,
   starting with "starting_file.txt" through the last file in the same directory (ordered by mtime)
-  and sends data to InfluxDB v1.11.8
+  and sends data to InfluxDB v1.11.8 in batches of up to --batch-size lines per POST
+
+Requirements:
+  pip install requests
 
 Usage:
   python3 feed_txt_to_InfluxDBv1.py /path/to/starting_file.txt
@@ -17,12 +20,22 @@ Attention:
 """
 
 import argparse
+import atexit
+import gzip
+import ctypes, ctypes.util
+import os, select, struct
+import queue, threading
 import sys
 import calendar, time
+import functools
+import re
 from datetime import datetime, timezone
-import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------#
 # Configuration constants
@@ -34,7 +47,19 @@ INFLUXDB_DB_NAME = 'influxdb_name'
 MEASUREMENT = 'mydatameasurement'
 LOG_FILE = f'feed_{MEASUREMENT}_to_InfluxDBv1.log'
 CHECK_INTERVAL = 60  # seconds
+BATCH_SIZE = 1000  # lines per POST
+GZIP_LEVEL = 1  # gzip level of the POST body, 0 to send it uncompressed
+WRITERS = 1  # concurrent POSTs, one keep-alive connection each; >1 may post out of order
+READ_CHUNK = 1 << 16  # bytes read from the file per chunk
+LOG_FLUSH_EVERY = 100  # log messages buffered before they are written to LOG_FILE
+RESCAN_INTERVAL = 600  # seconds between full rescans of the directory
 INFLUXDB_URL = f'http://{HOST}:{PORT}/write?db={INFLUXDB_DB_NAME}'
+FIELDS = (
+    'T1', 'T2', 'T3', 'T4',
+    'Pwr1', 'Pwr2', 'Pwr3', 'Pwr4',
+    'LEDamp', 'LEDwidth', 'Threshold',
+    'V1', 'V2', 'V3', 'V4',
+    )
 
 """
 In the case with user authorization:
@@ -43,72 +68,487 @@ INFLUXDB_PASSWORD = 'your_password'
 INFLUXDB_URL = f"http://{HOST}:{PORT}/write?db={INFLUXDB_DB_NAME}&u={INFLUXDB_USERNAME}&p={INFLUXDB_PASSWORD}"
 """
 
+# The whole {MEASUREMENT} line, the 'T1=...,V4=...' field set and the line protocol, compiled once, as bytes
+MEASUREMENT_B = MEASUREMENT.encode()
+_MEASUREMENT_PREFIX = MEASUREMENT_B + b','
+_LINE_RE = re.compile(re.escape(MEASUREMENT_B) + rb',([^,]+)' * (1 + len(FIELDS) + 1))
+_FIELDS_FMT = b','.join(b'%s=%%s' % name.encode() for name in FIELDS)
+_LINE_PROTOCOL_FMT = MEASUREMENT_B + b',host=%s ' + _FIELDS_FMT + b' %d'
+
 # ---------------------------------------------------------------------------#
 # Functions / classes
 # ---------------------------------------------------------------------------#
 
+_log_fh = None       # LOG_FILE, opened once on the first log() call
+_log_pending = 0     # messages written since the last flush
+_log_lock = threading.Lock()  # log() is called from the writer threads too
+
+
 def log(message: str) -> None:
-    """Append a timestamped message to the local log file."""
+    """Append a timestamped message to the local log file (buffered, see log_flush)."""
+    global _log_fh, _log_pending
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S GMT")
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} {message}\n")
+    with _log_lock:
+        if _log_fh is None:
+            _log_fh = open(LOG_FILE, "ab", buffering=1 << 16)
+            atexit.register(_log_fh.close)
+        _log_fh.write(f"{timestamp} {message}\n".encode("utf-8"))
+        _log_pending += 1
+        if _log_pending >= LOG_FLUSH_EVERY:
+            _log_fh.flush()
+            _log_pending = 0
+
+
+def log_flush() -> None:
+    """Write the buffered log messages to LOG_FILE."""
+    global _log_pending
+    with _log_lock:
+        if _log_fh is not None:
+            _log_fh.flush()
+        _log_pending = 0
+
+
+class DirState:
+    """
+    The *.txt files of a directory sorted by mtime (oldest first), cached between EOF polls.
+
+    Files created or removed as reported by the Watcher are applied incrementally;
+    the directory is rescanned only when that information is missing or every 'rescan_every' seconds.
+    """
+    def __init__(self, directory: Path, rescan_every: float = RESCAN_INTERVAL):
+        self.directory = directory
+        self.rescan_every = rescan_every
+        self.files: List[Path] = []
+        self.mtimes: Dict[Path, float] = {}
+        self.index: Dict[Path, int] = {}  # position of each file in self.files
+        self.last_scan = 0.0
+        self.rescan()
+
+    def rescan(self) -> None:
+        """Glob and stat the whole directory."""
+        mtimes = {}
+        for p in self.directory.glob("*.txt"):
+            try:
+                mtimes[p] = p.stat().st_mtime
+            except FileNotFoundError:
+                pass
+        self.mtimes = mtimes
+        self.files = sorted(mtimes, key=mtimes.__getitem__)
+        self._reindex()
+        self.last_scan = time.monotonic()
+
+    def _reindex(self) -> None:
+        self.index = {p: i for i, p in enumerate(self.files)}
+
+    def remove(self, path: Path) -> None:
+        """Drop a deleted (or moved away) file from the sorted list."""
+        if self.mtimes.pop(path, None) is not None:
+            self.files.remove(path)
+            self._reindex()
+
+    def add(self, path: Path) -> None:
+        """Add a new (or replaced) file to the sorted list, drop it if it is already gone."""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self.remove(path)
+            return
+        replaced = path in self.mtimes
+        if replaced:
+            self.files.remove(path)
+        self.mtimes[path] = mtime
+        self.files.append(path)
+        # a new file is nearly always the newest one, sort only if it is not
+        if len(self.files) > 1 and mtime < self.mtimes[self.files[-2]]:
+            self.files.sort(key=self.mtimes.__getitem__)
+            self._reindex()
+        elif replaced:
+            self._reindex()
+        else:
+            self.index[path] = len(self.files) - 1
+
+    def find_next_file(self, current: Path) -> Optional[Path]:
+        """Return the file after 'current' file, else None."""
+        idx = self.index.get(current)
+        if idx is None:
+            return self.files[-1] if self.files else None
+        return self.files[idx + 1] if idx + 1 < len(self.files) else None
+
+    def update(self, changed: Optional[List[str]]) -> None:
+        """Apply the file names created or removed in the directory, None if they are unknown."""
+        if changed is None or time.monotonic() - self.last_scan > self.rescan_every:
+            self.rescan()
+            return
+        for name in changed:
+            if name.endswith(".txt"):
+                self.add(self.directory / name)
+
+
+_ISO_Z_RE = re.compile(rb'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ')
+_last_iso = b""       # last converted timestamp
+_last_ns = 0          # its epoch-nanoseconds
+_last_minute = b""    # last seen 'YYYY-MM-DDTHH:MM' prefix
+_last_minute_s = 0    # its epoch-seconds
+
+
+def _iso_z_error(iso_z: bytes) -> ValueError:
+    return ValueError(f"time data '{iso_z.decode('latin-1')}' does not match format '%Y-%m-%dT%H:%M:%SZ'")
+
+
+def iso_z_to_ns(iso_z: bytes) -> int:
+    """Convert an ISO-8601 timestamp as b'2025-06-09T21:58:12Z' to epoch-nanoseconds, UTC."""
+    global _last_iso, _last_ns, _last_minute, _last_minute_s
+    # adjacent lines often carry the same second
+    if iso_z == _last_iso:
+        return _last_ns
+    # separators and digits checked in one C-level match, no time.strptime
+    if _ISO_Z_RE.fullmatch(iso_z) is None:
+        raise _iso_z_error(iso_z)
+    second = int(iso_z[17:19])
+    if second > 61:  # 60 and 61 are accepted, as by strptime's %S
+        raise _iso_z_error(iso_z)
+    minute = iso_z[:16]
+    if minute != _last_minute:
+        # datetime() range-checks month, day, hour and minute
+        try:
+            dt = datetime(
+                int(iso_z[0:4]), int(iso_z[5:7]), int(iso_z[8:10]),
+                int(iso_z[11:13]), int(iso_z[14:16]), tzinfo=timezone.utc
+                )
+        except ValueError:
+            raise _iso_z_error(iso_z) from None
+        _last_minute_s = calendar.timegm(dt.utctimetuple())
+        _last_minute = minute
+    _last_ns = (_last_minute_s + second) * 1_000_000_000
+    _last_iso = iso_z
+    return _last_ns
+
+
+_NS_RE = re.compile(rb'\d+')
+
 
+def ns_to_ns(ns: bytes) -> int:
+    """Check an epoch-nanoseconds timestamp as b'1749506292000000000' and return it as int."""
+    # int() alone would also take b' 17_49 ', b'+17' or b'-17'
+    if _NS_RE.fullmatch(ns) is None:
+        raise ValueError(f"time data '{ns.decode('latin-1')}' is not epoch-nanoseconds")
+    return int(ns)
 
-def list_txt_files(directory: Path) -> List[Path]:
-    """Return *.txt files in dir_path sorted by mtime (oldest first)."""
-    return sorted(directory.glob("*.txt"), key=lambda p: p.stat().st_mtime)
 
+# --ts-format: how the last field of a line is turned into epoch-nanoseconds
+TS_PARSERS: Dict[str, Callable[[bytes], int]] = {
+    'iso': iso_z_to_ns,                                           # 2025-06-09T21:58:12Z
+    'iso-cached': functools.lru_cache(maxsize=1024)(iso_z_to_ns),  # same, for interleaved timestamps
+    'ns': ns_to_ns,                                               # 1749506292000000000
+    }
 
-def find_next_file(current: Path, files: List[Path]) -> Optional[Path]:
-    """Return the file after 'current' file, else None."""
+
+class Watcher:
+    """
+    Wait at EOF for the current file to grow or for a new file in its directory.
+
+    Uses Linux inotify through libc (IN_MODIFY on the file,
+    IN_CREATE|IN_MOVED_TO|IN_DELETE|IN_MOVED_FROM on the directory),
+    so wait() returns as soon as something happens.
+    Falls back to a plain time.sleep() where inotify is not available.
+    """
+    IN_MODIFY = 0x00000002
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o0004000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: Path):
+        self.fd = -1
+        self.wd_file = -1
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if self.fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+            self.wd_dir = self._add_watch(
+                directory, self.IN_CREATE | self.IN_MOVED_TO | self.IN_DELETE | self.IN_MOVED_FROM
+            )
+        except (OSError, AttributeError) as e:
+            self.close()
+            log(f"[INFO] inotify is not available ({e}), polling every wait interval instead")
+
+    def _add_watch(self, path: Path, mask: int) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch({path}): {os.strerror(ctypes.get_errno())}")
+        return wd
+
+    def watch_file(self, path: Path, fd: int) -> None:
+        """
+        Move the IN_MODIFY watch to the file being read now, open as 'fd'.
+
+        The watch goes on /proc/self/fd/<fd> where there is one, so it is on the open
+        file even if 'path' was renamed meanwhile. If it cannot be added, polls instead.
+        """
+        if self.fd < 0:
+            return
+        if self.wd_file >= 0:
+            self.libc.inotify_rm_watch(self.fd, self.wd_file)
+            self.wd_file = -1
+        proc_fd = Path(f"/proc/self/fd/{fd}")
+        try:
+            self.wd_file = self._add_watch(proc_fd if proc_fd.exists() else path, self.IN_MODIFY)
+        except OSError as e:
+            self.close()
+            log(f"[INFO] inotify watch on {path} failed ({e}), polling every wait interval instead")
+
+    def wait(self, timeout: float) -> Optional[List[str]]:
+        """
+        Block until an inotify event arrives or 'timeout' seconds pass.
+
+        Return the names of the files created or removed in the directory meanwhile
+        (the caller stats them to tell which), or None if they are unknown (no inotify, or the event queue overflowed).
+        """
+        if self.fd < 0:
+            time.sleep(timeout)
+            return None
+        changed: Optional[List[str]] = []
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            # drain the queued events, the caller re-checks the file itself
+            try:
+                while True:
+                    data = os.read(self.fd, 65536)
+                    pos = 0
+                    while pos < len(data):
+                        wd, mask, _cookie, length = struct.unpack_from("iIII", data, pos)
+                        pos += 16
+                        if mask & self.IN_Q_OVERFLOW:
+                            changed = None
+                        elif wd == self.wd_dir and changed is not None:
+                            changed.append(os.fsdecode(data[pos:pos + length].rstrip(b"\0")))
+                        pos += length
+            except BlockingIOError:
+                pass
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+        self.fd = -1
+
+
+def file_id(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (st_dev, st_ino) of the file named 'path', None if there is none."""
     try:
-        idx = files.index(current)
-    except ValueError:
-        return files[-1] if files else None
-    return files[idx + 1] if idx + 1 < len(files) else None
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino)
 
 
-def iso_z_to_ns(iso_z: str) -> int:
-    """Convert an ISO-8601 timestamp as 2025-06-09T21:58:12Z to epoch-nanoseconds, UTC."""
-    return calendar.timegm(time.strptime(iso_z, "%Y-%m-%dT%H:%M:%SZ")) * 1_000_000_000
+class TailReader:
+    """
+    Read the complete lines appended to a file with os.pread, keeping an incomplete last line buffered.
+
+    Nothing is mapped, so a file truncated under the reader cannot fault it (SIGBUS).
+    A file found shorter than the read offset was truncated (copytruncate) and is read
+    again from the start; if it already grew back past that offset by then, the truncation
+    cannot be seen, so rotation by truncating is not supported: rotate by renaming instead.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.f = path.open("rb")
+        self.fd = self.f.fileno()
+        self.pos = 0               # file offset read up to, including self.buf
+        self.buf = bytearray()     # read but not yet returned, no newline in it
+        st = os.fstat(self.fd)
+        self.file_id = (st.st_dev, st.st_ino)  # follows the file through renames
+
+    def __enter__(self) -> "TailReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read(self, max_bytes: int) -> bytes:
+        """Read up to 'max_bytes' at the offset, starting over if the file was truncated."""
+        data = os.pread(self.fd, max_bytes, self.pos)
+        if not data and os.fstat(self.fd).st_size < self.pos:
+            log(f"[WARN] {self.path} was truncated, reading it again from the start")
+            self.pos = 0
+            self.buf.clear()
+            data = os.pread(self.fd, max_bytes, 0)
+        self.pos += len(data)
+        return data
+
+    def read_lines(self, max_bytes: int) -> bytes:
+        """Return the next complete lines (about 'max_bytes'), b'' if no complete line is there yet."""
+        while True:
+            data = self._read(max_bytes)
+            self.buf += data
+            nl = self.buf.rfind(b"\n")
+            if nl >= 0:
+                chunk = bytes(self.buf[:nl + 1])
+                del self.buf[:nl + 1]
+                return chunk
+            if not data:
+                return b""
+            # a single line longer than max_bytes, read on
+
+    def idle_for(self) -> float:
+        """Return the seconds since the file was last written to."""
+        return time.time() - os.fstat(self.fd).st_mtime
+
+    def read_rest(self) -> bytes:
+        """Return everything left, including a last line without a newline."""
+        while True:
+            data = self._read(READ_CHUNK)
+            if not data:
+                break
+            self.buf += data
+        chunk = bytes(self.buf)
+        self.buf.clear()
+        return chunk
+
+    def close(self) -> None:
+        self.f.close()
 
 
 class Sender:
-    """Wrapper around a 'curl' to post a line-protocol string."""
-    def __init__(self, url):
+    """Wrapper around a persistent 'requests.Session' to post a line-protocol string."""
+    def __init__(self, url, gzip_level: int = GZIP_LEVEL):
         self.url = url
+        self.gzip_level = gzip_level
+        # one keep-alive connection to InfluxDB, reused for every POST
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+            )
+        self.session.mount("http://", adapter)
+        self.session.headers["Content-Type"] = "text/plain; charset=utf-8"
+
+    def post(self, payload: bytes, timeout: int = 10) -> None:
+        """POST the payload (one or more line-protocol lines), raising on any non-2xx response."""
+        headers = None
+        if self.gzip_level:
+            # line protocol is repetitive ASCII, the fastest level already shrinks it several times
+            payload = gzip.compress(payload, compresslevel=self.gzip_level)
+            headers = {"Content-Encoding": "gzip"}
+        r = self.session.post(self.url, data=payload, headers=headers, timeout=timeout)
+        r.raise_for_status()
+
+    def report_error(self, e: Exception, timeout: int = 10) -> None:
+        """Log and print a failed POST."""
+        if isinstance(e, requests.exceptions.HTTPError):
+            msg = (e.response.text or "").strip()
+            log(f"[ERROR] InfluxDB returned HTTP {e.response.status_code}: {msg}")
+            print(f"[ERROR] InfluxDB returned HTTP {e.response.status_code}: {msg}")
+        elif isinstance(e, requests.exceptions.Timeout):
+            log(f"[ERROR] HTTP timeout after {timeout}s: {e}")
+            print(f"[ERROR] HTTP timeout after {timeout}s: {e}")
+        elif isinstance(e, requests.exceptions.ConnectionError):
+            log(f"[ERROR] Connection to InfluxDB failed: {e}")
+            print(f"[ERROR] Connection to InfluxDB failed: {e}")
+        else:
+            log(f"[ERROR] Unexpected error during POST: {e}")
+            print(f"[ERROR] Unexpected error during POST: {e}")
+
+    def send(self, line_protocol: bytes, timeout: int = 10) -> None:
+        """It's a POST of the line_protocol, raising on any non-2xx response."""
+        try:
+            self.post(line_protocol, timeout=timeout)
+        except Exception as e:
+            self.report_error(e, timeout)
+            raise
+
+
+class BatchSender:
+    """
+    Collect line-protocol strings and post them to InfluxDB in newline-separated batches.
 
-    def send(self, line_protocol: str, timeout: int = 10) -> None:
-        """It's a 'curl' with '--fail', '--silent', '--show-error' for the line_protocol."""
-        cmd = ['curl', '-f', '-sS', '-XPOST', self.url, '--data-binary', line_protocol]
+    Full batches go through a bounded queue to one writer thread per Sender,
+    so parsing goes on while up to len(senders) POSTs are in flight.
+    A failed POST is raised in the caller on its next enqueue() or flush().
+    Each line keeps the file ('source', set by the caller) and line number it came from,
+    to report a line InfluxDB rejects.
+    """
+    def __init__(self, senders: List[Sender], max_lines: int = 1000, max_age: float = 1.0, max_queued: int = 16):
+        self.max_lines = max_lines
+        self.max_age = max_age  # seconds
+        self.buf: List[bytes] = []
+        self.origins: List[Tuple[Optional[Path], int]] = []  # (source, line number) of each line in buf
+        self.source: Optional[Path] = None
+        self.first_ts = 0.0
+        self.queue: "queue.Queue[Tuple[List[bytes], List[Tuple[Optional[Path], int]]]]" = queue.Queue(maxsize=max_queued)
+        self.error: Optional[Exception] = None
+        for sender in senders:
+            threading.Thread(target=self._writer, args=(sender,), daemon=True).start()
+
+    def _writer(self, sender: Sender) -> None:
+        while True:
+            lines, origins = self.queue.get()
+            try:
+                # after a failure, drop the rest, the script is stopping
+                if self.error is None:
+                    self._post(sender, lines, origins)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    @staticmethod
+    def _post(sender: Sender, lines: List[bytes], origins: List[Tuple[Optional[Path], int]], timeout: int = 10) -> None:
+        """Post one batch. On HTTP 400, resend line by line to isolate the bad line."""
         try:
-            subprocess.run(
-                cmd, 
-                check=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout
-                )
+            sender.post(b"\n".join(lines), timeout=timeout)
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code != 400:
+                sender.report_error(e, timeout)
+                raise
+            if len(lines) > 1:
+                log(f"[WARN] Batch of {len(lines)} lines rejected with HTTP 400, resending line by line")
+            for line_protocol, (source, line_number) in zip(lines, origins):
+                try:
+                    sender.send(line_protocol, timeout=timeout)
+                except requests.exceptions.HTTPError:
+                    log(f"[ERROR] InfluxDB rejected Line {line_number} of {source} : {line_protocol.decode('utf-8', 'replace')}")
+                    raise
         except Exception as e:
-            if isinstance(e, subprocess.CalledProcessError):
-                msg = (e.stderr or e.stdout or "").strip()
-                log(f"[ERROR] curl exited with code {e.returncode}: {msg}")
-                print(f"[ERROR] curl exited with code {e.returncode}: {msg}")
-            elif isinstance(e, subprocess.TimeoutExpired):
-                log(f"[ERROR] curl timeout after {timeout}s: {e}")
-                print(f"[ERROR] curl timeout after {timeout}s: {e}")
-            elif isinstance(e, FileNotFoundError):
-                log("[ERROR] curl not found on PATH")
-                print("[ERROR] curl not found on PATH")
-            else:
-                log(f"[ERROR] Unexpected error during curl: {e}")
-                print(f"[ERROR] Unexpected error during curl: {e}")
+            sender.report_error(e, timeout)
             raise
-            
 
-def process_line(line: str, sender: Sender, line_number: int) -> None:
+    def _submit(self) -> None:
+        """Hand the pending batch to the writers, blocking while the queue is full."""
+        if self.error is not None:
+            raise self.error
+        if self.buf:
+            # cleared only once queued: a Ctrl+C while put() blocks keeps the batch for flush()
+            self.queue.put((self.buf, self.origins))
+            self.buf, self.origins = [], []
+
+    def enqueue(self, line_protocol: bytes, line_number: int = 0) -> None:
+        """Add one line_protocol to the batch, submitting it when full or too old."""
+        if not self.buf:
+            self.first_ts = time.monotonic()
+        self.buf.append(line_protocol)
+        self.origins.append((self.source, line_number))
+        if len(self.buf) >= self.max_lines or time.monotonic() - self.first_ts > self.max_age:
+            self._submit()
+
+    def flush(self) -> None:
+        """Submit the pending batch and wait until every batch is posted."""
+        self._submit()
+        self.queue.join()
+        log_flush()
+        if self.error is not None:
+            raise self.error
+
+
+def process_line(line: bytes, sender: BatchSender, line_number: int, verbose: bool = False, ts_format: str = 'iso') -> None:
     """
-    Parse one {MEASUREMENT} line and forward it as line_protocol to InfluxDB via sender.
+    Parse one {MEASUREMENT} line and queue it as line_protocol for InfluxDB via sender.
 
     The MYDATA schema:
         mydatameasurement,<host>,
@@ -117,101 +557,141 @@ def process_line(line: str, sender: Sender, line_number: int) -> None:
             <LEDamp>,<LEDwidth>,<Threshold>,
             <V1>,<V2>,<V3>,<V4>,
         <ISO-8601-timestamp-Z>
+
+    With ts_format 'ns' the producer writes the timestamp as epoch-nanoseconds
+    instead, which skips the ISO-8601 conversion entirely.
     """
     try:
-        parts = line.split(',')
-        expected_len = 2 + 15 + 1 # (mydatameasurement + <host>) + 15 + <timestamp>
-        if len(parts) != expected_len:
-            log(f"[SKIP] Unexpected 'expected_len' in line {line_number} : {line}")
+        # (mydatameasurement + <host>) + 15 + <timestamp>, matched in one pass, no split() list
+        m = _LINE_RE.fullmatch(line)
+        if m is None:
+            log(f"[SKIP] Unexpected format in line {line_number} : {line.decode('utf-8', errors='replace')}")
             return
+        parts = m.groups()
 
-        host = parts[1]
-        measurement_time_str = parts[-1]
-        measurement_time = iso_z_to_ns(measurement_time_str)
-
-        t1  = parts[2]
-        t2 = parts[3]
-        t3  = parts[4]
-        t4 = parts[5]
+        measurement_time = TS_PARSERS[ts_format](parts[-1])
 
-        pwr1  = parts[6]
-        pwr2 = parts[7]
-        pwr3  = parts[8]
-        pwr4 = parts[9]
-
-        LEDamp  = parts[10]
-        LEDwidth = parts[11]
-        Threshold  = parts[12]
-
-        v1  = parts[13]
-        v2 = parts[14]
-        v3  = parts[15]
-        v4 = parts[16]
-
-        tags = f"host={host}"
-        fields = (f"T1={t1},T2={t2},T3={t3},T4={t4},Pwr1={pwr1},Pwr2={pwr2},Pwr3={pwr3},Pwr4={pwr4},LEDamp={LEDamp},LEDwidth={LEDwidth},Threshold={Threshold},V1={v1},V2={v2},V3={v3},V4={v4}")
-        line_protocol = f"{MEASUREMENT},{tags} {fields} {measurement_time}"
-        print(f"[PARSED] Line {line_number} : host={host}, {fields}, time={measurement_time}")
-        
-        sender.send(line_protocol)
+        # host, the 15 fields and the time go into one bytes %-format, no intermediate strings
+        line_protocol = _LINE_PROTOCOL_FMT % (*parts[:-1], measurement_time)
 
     except Exception as e:
-        log(f"[ERROR] Parse failed on Line {line_number} : {line} | Reason: {e}")
+        log(f"[ERROR] Parse failed on Line {line_number} : {line.decode('utf-8', errors='replace')} | Reason: {e}")
         # stop script if error
         raise
     
     else:
-        log(f"[PARSED] Line {line_number} : {line}")
+        # outside the try: a failed POST raised from here is not a parse failure of this line
+        sender.enqueue(line_protocol, line_number)
+        if verbose:
+            host = parts[0].decode("utf-8", errors="replace")
+            fields = (_FIELDS_FMT % parts[1:-1]).decode("utf-8", errors="replace")
+            print(f"[PARSED] Line {line_number} : host={host}, {fields}, time={measurement_time}")
+            log(f"[PARSED] Line {line_number} : {line.decode('utf-8', errors='replace')}")
 
 # ---------------------------------------------------------------------------#
 # The main logic
 # ---------------------------------------------------------------------------#
 
-def process_files(start_file: Path, sender: Sender, wait_time: int = 60) -> None:
+def process_chunk(chunk: bytes, sender: BatchSender, line_number: int, verbose: bool = False, ts_format: str = 'iso') -> int:
+    """Parse the {MEASUREMENT} lines of a chunk read from the file. Return the last line_number."""
+    if chunk.endswith(b"\n"):
+        chunk = chunk[:-1]
+    for line in chunk.split(b"\n"):
+        line_number += 1
+        # reject noise lines on the raw bytes, before any strip()
+        if not line.startswith(_MEASUREMENT_PREFIX):
+            continue
+        process_line(line.rstrip(), sender, line_number, verbose, ts_format)
+    return line_number
+
+
+def open_tail(path: Path, dir_state: DirState) -> Optional[TailReader]:
+    """Open 'path' for reading, or rescan the directory and return None if it was removed meanwhile."""
+    try:
+        return TailReader(path)
+    except FileNotFoundError:
+        log(f"[INFO] {path} was removed before it could be opened, rescanning the directory")
+        dir_state.rescan()
+        return None
+
+
+def process_files(start_file: Path, sender: BatchSender, wait_time: int = 60, verbose: bool = False, ts_format: str = 'iso') -> None:
 
     directory = start_file.parent
     current = start_file
+    watcher = Watcher(directory)
+    dir_state = DirState(directory)
+    tail = TailReader(current)
 
     # external infinite loop
     while True:
         try:
-            # open file
-            with current.open("r", encoding="utf-8", errors="replace") as f:
+            # the file opened by the previous pass
+            with tail:
                 log(f"[OPEN] Processing file: {current}")
+                watcher.watch_file(current, tail.fd)
+                sender.source = current
                 line_number = 0
                 # internal loop
                 while True:
-                    # read line up to the EOF
-                    line = f.readline()
-                    if line:
-                        line_number += 1
-                        line = line.strip()
-                        if line.startswith(MEASUREMENT):
-                            process_line(line, sender, line_number)
-                            continue
-
-                    # EOF
-                    time.sleep(wait_time)
-
-                    # Try once more in a 'wait_time'
-                    line = f.readline()
-                    if line:
-                        line_number += 1
-                        line = line.strip()
-                        if line.startswith(MEASUREMENT):
-                            process_line(line, sender, line_number)
-                            continue
-
-                    # Still no data -> check the file's directory for a new file.
-                    newer = find_next_file(current, list_txt_files(directory))
+                    # read complete lines up to the EOF, a chunk at a time
+                    chunk = tail.read_lines(READ_CHUNK)
+                    if chunk:
+                        line_number = process_chunk(chunk, sender, line_number, verbose, ts_format)
+                        continue
+
+                    # EOF -> send what is buffered before waiting
+                    sender.flush()
+                    dir_state.update(watcher.wait(wait_time))
+
+                    # Try once more after the file changed or in a 'wait_time'
+                    chunk = tail.read_lines(READ_CHUNK)
+                    if chunk:
+                        line_number = process_chunk(chunk, sender, line_number, verbose, ts_format)
+                        continue
+
+                    # A new file does not end this one while it is still written to: wait until it
+                    # has been idle for 'wait_time', so a line being written is not cut short
+                    if tail.idle_for() < wait_time:
+                        continue
+
+                    # Still no data -> was the file rotated and a new one created under its name?
+                    current_id = file_id(current)
+                    if current_id is not None and current_id != tail.file_id:
+                        next_tail = open_tail(current, dir_state)
+                        if next_tail:
+                            chunk = tail.read_rest()
+                            if chunk:
+                                line_number = process_chunk(chunk, sender, line_number, verbose, ts_format)
+                            log(f"[INFO] {current} was replaced by a new file, reopening it")
+                            tail = next_tail
+                            break
+                        continue
+
+                    # Check the file's directory for a new file.
+                    newer = dir_state.find_next_file(current)
+                    if newer and file_id(newer) == tail.file_id:
+                        # the open file itself was renamed, keep reading it under the new name
+                        current = sender.source = newer
+                        continue
                     if newer:
-                        current = newer
-                        # Break inner loop to open the newer file. Otherwise, readline() again
+                        next_tail = open_tail(newer, dir_state)
+                        if next_tail is None:
+                            # gone before it could be opened, look again after the next wait
+                            continue
+                        # the old file is done, take its last line even without a newline
+                        chunk = tail.read_rest()
+                        if chunk:
+                            line_number = process_chunk(chunk, sender, line_number, verbose, ts_format)
+                        current, tail = newer, next_tail
+                        # Break inner loop to read the newer file. Otherwise, read again
                         break
 
         except KeyboardInterrupt:
+            watcher.close()
             raise
-        except Exception: # propagate curl
+        except Exception: # propagate sender errors
+            watcher.close()
             raise
 
 # ---------------------------------------------------------------------------#
@@ -220,7 +700,7 @@ def process_files(start_file: Path, sender: Sender, wait_time: int = 60) -> None
             
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description=f"Parse the *.txt log files for the {MEASUREMENT} and send it line by line to InfluxDB v1.11.8"
+        description=f"Parse the *.txt log files for the {MEASUREMENT} and send it to InfluxDB v1.11.8 in batches of lines per POST (--batch-size)"
     )
     parser.add_argument(
         "start_file",
@@ -232,25 +712,86 @@ def main() -> None:
         type=int,
         default=CHECK_INTERVAL,
         metavar="SECONDS",
-        help="Seconds to wait at EOF before polling again (default: 60).",
+        help="Max seconds to wait at EOF for new data before polling again (default: 60).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        metavar="LINES",
+        help="Max number of lines per POST to InfluxDB (default: 1000).",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=WRITERS,
+        metavar="N",
+        help="Number of batches posted to InfluxDB concurrently (default: 1). More than 1 may post "
+             "batches out of order, so of two points with the same series and timestamp "
+             "the one kept is not always the later line.",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        default=None,
+        metavar="CORE",
+        help="Pin the script to this CPU core (Linux), best isolated with the 'isolcpus=' kernel option.",
+    )
+    parser.add_argument(
+        "--ts-format",
+        choices=sorted(TS_PARSERS),
+        default="iso",
+        help="Format of the timestamp field: 'iso' (2025-06-09T21:58:12Z, default), "
+             "'iso-cached' (same with an LRU cache, for interleaved timestamps) "
+             "or 'ns' (epoch-nanoseconds written by the producer, no conversion).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print and log every successfully parsed line.",
     )
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.writers < 1:
+        parser.error("--writers must be at least 1")
+    if args.cpu is not None and not 0 <= args.cpu < (os.cpu_count() or 1):
+        parser.error(f"--cpu must be between 0 and {(os.cpu_count() or 1) - 1}")
 
     start_file: Path = args.start_file.expanduser().resolve()
     if not start_file.is_file():
         sys.exit(f"Start file '{start_file}' does not exist or is not a regular file.")
 
-    sender = Sender(INFLUXDB_URL)
+    if args.cpu is not None:
+        try:
+            os.sched_setaffinity(0, {args.cpu})
+        except (AttributeError, OSError, ValueError, OverflowError) as e:
+            sys.exit(f"Cannot pin to CPU {args.cpu}: {e}")
 
+    sender = BatchSender(
+        [Sender(INFLUXDB_URL) for _ in range(args.writers)],
+        max_lines=args.batch_size
+        )
 
     try:
-        process_files(start_file, sender, wait_time=args.wait)
+        process_files(start_file, sender, wait_time=args.wait, verbose=args.verbose, ts_format=args.ts_format)
     
     except KeyboardInterrupt:
+        try:
+            sender.flush()
+        except Exception as e:
+            log(f"[FATAL] {e}")
+            sys.exit(1)
         log("[INFO] Interrupted by user.")
         print("\nInterrupted by user.")
         sys.exit(0)
     except Exception as e:
+        # still send the lines parsed before the failure, unless sending is what failed
+        try:
+            sender.flush()
+        except Exception as flush_error:
+            if flush_error is not e:
+                log(f"[ERROR] Pending lines could not be sent: {flush_error}")
         log(f"[FATAL] {e}")
         sys.exit(1)
 